@@ -30,7 +30,7 @@
 import Metashape
 from PySide2.QtWidgets import *
 from PySide2 import QtGui, QtCore, QtWidgets
-from PySide2.QtCore import Qt
+from PySide2.QtCore import Qt, QTimer, QSignalBlocker, QObject, Signal
 from PySide2.QtGui import QFont, QFontDatabase
 
 
@@ -38,25 +38,239 @@ import math
 import json
 import os.path
 import os
+import sys
+import glob
 import datetime 
 
+import numpy as np
+
 from collections import OrderedDict
-from copy import deepcopy
+from dataclasses import dataclass
+from functools import partial
+
+# optional, considerably faster serialization of the chunk memory
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+
+# translation between the name of each cleaning step and the index of its tab
+_STEP_TO_IX = {'Reconstruction Uncertainty': 0,
+               'Projection Accuracy': 1,
+               'Reprojection Error': 2,
+               'Reprojection Error (RMSE Minimization)': 3,
+               }
+
+_IX_TO_STEP = tuple(_STEP_TO_IX)
+
+# top level entries of the tree widget
+_TREE_KEYS = ('Step 1', 'Step 2', 'Step 3', 'Step 4')
+
+# child entries of each step in the tree widget
+_TREE_LABELS = ("Num. iterations", "Num. points", "RMSE", "SEUW", "Camera error", "Control scale error", "Check scale error", 
+                "Control point error",  "Check point error", "Level", "Num. proj. <100", "Rev. it. / pts.")
+
+# empty results of a single step as stored in the chunk memory
+_TREE_RESULT_EMPTY = dict.fromkeys(_TREE_LABELS, '')
+
+# tree entries stored in the form 'begin ---> final (unit)'
+# label, number of decimals (None for integer values), unit, number of tokens
+_TREE_FIELDS = (('Num. points', None, '', 2),
+                ('RMSE', 5, ' (pix)', 3),
+                ('SEUW', 5, '', 3),
+                ('Camera error', 6, ' (m)', 3),
+                ('Control scale error', 6, ' (m)', 3),
+                ('Check scale error', 6, ' (m)', 3),
+                ('Check point error', 6, ' (m)', 3),
+                ('Control point error', 6, ' (m)', 3),
+                ('Num. proj. <100', None, '', 2),
+                ('Level', 6, '', 2),
+                )
+
+# keys of the camera fitting options, shared by the check boxes and the chunk memory
+# interned as they contain blanks and would not be interned by the compiler otherwise
+_FIT_F = sys.intern('Fit f')
+_FIT_K1 = sys.intern('Fit k1')
+_FIT_K2 = sys.intern('Fit k2')
+_FIT_K3 = sys.intern('Fit k3')
+_FIT_K4 = sys.intern('Fit k4')
+_FIT_CXCY = sys.intern('Fit cx, cy')
+_FIT_P1 = sys.intern('Fit p1')
+_FIT_P2 = sys.intern('Fit p2')
+_FIT_B1 = sys.intern('Fit b1')
+_FIT_B2 = sys.intern('Fit b2')
+_ADAPTIVE_FITTING = sys.intern('Adaptive camera model fitting')
+_TIEPOINT_COVARIANCE = sys.intern('Estimate tie point covariance')
+_FIT_CORRECTIONS = sys.intern('Fit additional corrections')
+
+# (key, row, column) of the check boxes in the 'General' group box of each tab
+_LAYOUT_MAP_GRID = ((_FIT_F, 1, 0), (_FIT_K1, 2, 0), (_FIT_K2, 3, 0), (_FIT_K3, 4, 0), (_FIT_K4, 5, 0),
+                    (_FIT_CXCY, 1, 1), (_FIT_P1, 2, 1), (_FIT_P2, 3, 1), (_FIT_B1, 4, 1), (_FIT_B2, 5, 1),
+                    )
+
+# keys of the check boxes in the 'Advanced' group box, top to bottom
+_LAYOUT_MAP_ADVANCED = (_ADAPTIVE_FITTING, _TIEPOINT_COVARIANCE, _FIT_CORRECTIONS)
+
+# deletes the arrow characters in a single pass, leaving the whitespace separated values
+_STRIP = str.maketrans('', '', '->')
+
+# date and time of a session entry in the combo box back to their file name form
+_FROM_DISPLAY = str.maketrans('/:', '--')
+
+
+
+def _parse_arrow(s):
+    '''splitting a tree entry of the form 'begin ---> final (unit)' into its tokens'''
+    return s.translate(_STRIP).split()
+
+
+def _dumps(obj):
+    '''serializing the chunk memory to bytes, integer keys are written as strings like json does'''
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+    if ujson is not None:
+        return ujson.dumps(obj, indent=4).encode('utf-8')
+    return json.dumps(obj, indent=4).encode('utf-8')
+
+
+def qthrottled(fn, timeout_ms=50, parent=None):
+    '''leading edge throttle: fn is called at once, further calls within timeout_ms are collapsed 
+       into a single call with the latest arguments; flush() executes a pending call immediately'''
+
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(timeout_ms)
+
+    pending = []
+
+    def call_pending():
+        if pending:
+            args = pending.pop()
+            pending.clear()
+            fn(*args)
+            timer.start()
+
+    def throttled(*args):
+        if timer.isActive():
+            pending[:] = [args]
+        else:
+            fn(*args)
+            timer.start()
+
+    def flush():
+        timer.stop()
+        call_pending()
+
+    timer.timeout.connect(call_pending)
+    throttled.flush = flush
+
+    return throttled
+
+
+def _set_if_changed(widget, value, setter, getter):
+    '''setting the value of a widget without emitting signals, skipped if the value is unchanged'''
+    if getter() != value:
+        with QSignalBlocker(widget):
+            setter(value)
+
+
+
+@dataclass
+class StepReport:
+    '''values before and after a cleaning step, as shown in the tree widget'''
+
+    # slots declared by hand, dataclass(slots=True) requires Python 3.10
+    __slots__ = ('step', 'n_iter', 'n_points_begin', 'n_points_left', 'rms_begin', 'rms_final', 
+                 'seuw_begin', 'seuw_final', 'cam_err_begin', 'cam_err_final', 'nproj_begin', 'nproj_final',
+                 'mark_err_control_begin', 'mark_err_control_final', 'mark_err_check_begin', 'mark_err_check_final',
+                 'scale_err_control_begin', 'scale_err_control_final', 'scale_err_check_begin', 'scale_err_check_final',
+                 'threshold_begin', 'threshold_final', 'rev_pts')
+
+    step: str
+    n_iter: int
+    n_points_begin: int
+    n_points_left: int
+    rms_begin: float
+    rms_final: float
+    seuw_begin: float
+    seuw_final: float
+    cam_err_begin: float
+    cam_err_final: float
+    nproj_begin: int
+    nproj_final: int
+    mark_err_control_begin: float
+    mark_err_control_final: float
+    mark_err_check_begin: float
+    mark_err_check_final: float
+    scale_err_control_begin: float
+    scale_err_control_final: float
+    scale_err_check_begin: float
+    scale_err_check_final: float
+    threshold_begin: float
+    threshold_final: float
+    rev_pts: str
+
+
+
+class DelayedNotification(QObject):
+    '''emits notification once changed() has not been called for timeout ms'''
+
+    notification = Signal()
+
+    def __init__(self, parent=None, timeout=500):
+        QObject.__init__(self, parent)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(timeout)
+        self._timer.timeout.connect(self.notification.emit)
+
+    def changed(self, *_):
+        self._timer.start()
+
+    def notifyImmediately(self):
+        self._timer.stop()
+        self.notification.emit()
+
+    def isActive(self):
+        return self._timer.isActive()
+
+    def stop(self):
+        self._timer.stop()
 
 
 
 class NewWindow(QDialog):
+
+    # tree widget entry of each cleaning step
+    _STEP_TRANSLATOR = dict(zip(_STEP_TO_IX, _TREE_KEYS))
+
     def __init__(self, parent):
         QDialog.__init__(self, parent)
         self.resize(840, 400)
 
         self.setWindowTitle('Sparse Cloud Cleaning')
+
+        # styles of all child widgets, resolved once for the whole dialog
+        self.setStyleSheet("QGroupBox { border: 1px solid lightgrey; } "
+                           "QLabel, QCheckBox, QSlider, QComboBox, QTreeWidget { border: none; } "
+                           "QLabel#headline { font-size: 9pt; }")
         
         self.doc = Metashape.app.document
 
         self.chunk = self.doc.chunks[0]
 
         self.camera_check_boxes = {}
+
+        # slots connected to the camera fit checkboxes
+        self._cam_check_slots = {}
         
         self.parameters = {'Reconstruction Uncertainty' : (0, 100, 1),
                            'Projection Accuracy' : (0, 20, 1),
@@ -64,10 +278,13 @@ class NewWindow(QDialog):
                            'Reprojection Error (RMSE Minimization)' : (0, 200, 0.01),
                            }
 
-        self.camera_fit_dict = OrderedDict({"Fit f" : True, "Fit k1" : True, "Fit k2" : True, "Fit k3" : True, "Fit k4" : False, 
-                                       "Fit cx, cy" : True, "Fit p1" : True, "Fit p2" : True, "Fit b1" : False, "Fit b2" : False, 
-                                       "Adaptive camera model fitting" : False, "Estimate tie point covariance" : True, 
-                                       "Fit additional corrections" : False})
+        self._param_range = {k: (v[0], v[1]) for k, v in self.parameters.items()}
+        self._scale_fac = {k: v[2] for k, v in self.parameters.items()}
+
+        self.camera_fit_dict = OrderedDict({_FIT_F : True, _FIT_K1 : True, _FIT_K2 : True, _FIT_K3 : True, _FIT_K4 : False, 
+                                       _FIT_CXCY : True, _FIT_P1 : True, _FIT_P2 : True, _FIT_B1 : False, _FIT_B2 : False, 
+                                       _ADAPTIVE_FITTING : False, _TIEPOINT_COVARIANCE : True, 
+                                       _FIT_CORRECTIONS : False})
                                        
                                        
         self.default_values = { 'Reconstruction Uncertainty':{'target_percent': 50., 'target_threshold': 10.,   'max_iter':1, 'tiepoint_accuracy':self.chunk.tiepoint_accuracy},
@@ -77,9 +294,45 @@ class NewWindow(QDialog):
                                 
                                }
         
+        # settings of a single tab as stored in the chunk memory
+        self._tab_settings_template = {'target_percent': None,
+                                       'target_threshold': None,
+                                       'num_iterations': None,
+                                       'tiepoint_accuracy': None,
+                                       **self.camera_fit_dict,
+                                       }
+
         # dictionary to store chunk specific settings and results
         # important to restore when user switches chunks
         self.chunk_memory = {}
+
+        # coalesces bursts of changes to the chunk memory into a single write of the session file
+        self._write_timer = QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(500)
+        self._write_timer.timeout.connect(self._flushChunkMemory)
+        self._last_payload_hash = None
+
+        # directory of the session files, cached per project path
+        self._session_doc = None
+        self._session_dir = None
+
+        # timers and callbacks of debounced line edit changes
+        self._debounced_edits = []
+
+        # number of cameras with less than 100 projections, keyed by the state of the tie points
+        self._proj_cache = {}
+
+        # SEUW of the latest camera optimization
+        self._sigma0 = None
+
+        # track ids of the projections of each aligned camera, they do not change while points are removed
+        self._proj_tids = {}
+        self._proj_tids_key = None
+
+        # the chunk selection is confirmed once, until another chunk is chosen
+        self._chunk_confirmed = False
+        self._chunk_confirmed_id = None
           
         self.chunk_combo_box = QComboBox()
            
@@ -89,20 +342,21 @@ class NewWindow(QDialog):
         self.tiepoint_ledits = {}
         self.chunk_dict = {}
         
+        self.chunk_combo_box.addItems([chunk.label for chunk in self.doc.chunks])
+
         for chunk in self.doc.chunks:
-            self.chunk_combo_box.addItem(chunk.label)
             self.addChunk(chunk)
 
+        self._refreshCur()
+
    
         self.chunk_combo_box.currentIndexChanged.connect(self.setCurrentChunk)
         self.chunk_combo_box.currentIndexChanged.connect(self.checkIfChunkInComboBox)
         self.chunk_combo_box.currentIndexChanged.connect(self.setChunkSpecificValues)
 
         self.chunk_label = QLabel('Name: ')
-        self.chunk_label.setStyleSheet("border: none;")
          
         chunk_group_box = QGroupBox('Chunk Selection')
-        chunk_group_box.setStyleSheet("QGroupBox { border: 1px solid lightgrey;}")
         chunk_group_box_layout = QHBoxLayout()
         chunk_group_box.setLayout(chunk_group_box_layout)
         chunk_group_box_layout.addWidget(self.chunk_label)
@@ -113,35 +367,13 @@ class NewWindow(QDialog):
 
         self.tabwidget = QTabWidget()
     
-        tab1 = self.makeStepWindow(step = 'Reconstruction Uncertainty', 
-                                   target_percent=self.default_values['Reconstruction Uncertainty']['target_percent'], 
-                                   target_threshold=self.default_values['Reconstruction Uncertainty']['target_threshold'],  
-                                   max_iter=self.default_values['Reconstruction Uncertainty']['max_iter'])
-                                   
-                                   
-        tab2 = self.makeStepWindow(step = 'Projection Accuracy', 
-                                   target_percent=self.default_values['Projection Accuracy']['target_percent'],
-                                   target_threshold=self.default_values['Projection Accuracy']['target_threshold'], 
-                                   max_iter=self.default_values['Projection Accuracy']['max_iter'])
-           
-        
-        tab3 = self.makeStepWindow(step = 'Reprojection Error', 
-                                   target_percent=self.default_values['Reprojection Error']['target_percent'], 
-                                   target_threshold=self.default_values['Reprojection Error']['target_threshold'],  
-                                   max_iter=self.default_values['Reprojection Error']['max_iter'])
-        
-        
-        tab4 = self.makeStepWindow(step = 'Reprojection Error (RMSE Minimization)', 
-                                   target_percent=self.default_values['Reprojection Error (RMSE Minimization)']['target_percent'], 
-                                   target_threshold=self.default_values['Reprojection Error (RMSE Minimization)']['target_threshold'],  
-                                   max_iter=self.default_values['Reprojection Error (RMSE Minimization)']['max_iter'])
+        # placeholders, the step windows are built when the respective tab is shown for the first time
+        self._tabs_built = set()
 
-        sum = self.makeSummaryWindow()
+        for key in _TREE_KEYS:
+            self.tabwidget.addTab(QWidget(), key)
 
-        self.tabwidget.addTab(tab1, "Step 1")
-        self.tabwidget.addTab(tab2, "Step 2")
-        self.tabwidget.addTab(tab3, "Step 3")
-        self.tabwidget.addTab(tab4, "Step 4")
+        sum = self.makeSummaryWindow()
        
 
 
@@ -173,14 +405,15 @@ class NewWindow(QDialog):
         auto_run_group_box_layout.addWidget(auto_run_button, 1, 2)
 
         self.auto_run_group_box.setLayout(auto_run_group_box_layout)
-        self.auto_run_group_box.setStyleSheet("QGroupBox { border: 1px solid lightgrey;}")
         self.auto_run_group_box.setCheckable(True)
         self.auto_run_group_box.setChecked(True)
 
         self.auto_run_group_box.clicked.connect(self.switchRunButtonsEnabledDisabled)
+
+        self._ensureTabBuilt(0)
+        self.tabwidget.currentChanged.connect(self._ensureTabBuilt)
 	
         self.preferences_widget = QWidget()
-        self.preferences_widget.setStyleSheet("border: none;")
      
         self.preferences_widget_layout = QGridLayout()
         
@@ -203,26 +436,37 @@ class NewWindow(QDialog):
 
         self.tree_widgets = {}
 
-        tree_keys = ['Step 1', 'Step 2', 'Step 3', 'Step 4']
-        
-        for key in tree_keys:
+        # items are built detached and inserted at once, so the view is laid out only once
+        self.tw.setUpdatesEnabled(False)
+        self.tw.setSortingEnabled(False)
+
+        parents = []
+
+        for key in _TREE_KEYS:
 
             self.tree_widgets.update({key:{}})
 
             l = QTreeWidgetItem([key, ""])
-            self.tw.addTopLevelItem(l)
+            parents.append(l)
+
+            children = []
 
-            for label in ["Num. iterations", "Num. points", "RMSE", "SEUW", "Camera error", "Control scale error", "Check scale error", 
-                          "Control point error",  "Check point error", "Level", "Num. proj. <100", "Rev. it. / pts."]:
+            for label in _TREE_LABELS:
 
                 if key == "Step 4" and label in ["Level","Rev. it. / pts." ]:
                     continue
                 
                 
                 child = QTreeWidgetItem([label, ""])             
-                l.addChild(child)
+                children.append(child)
                 self.tree_widgets[key].update({label:child})       
 
+            l.addChildren(children)
+
+        self.tw.insertTopLevelItems(0, parents)
+
+        self.tw.setUpdatesEnabled(True)
+
         self.preferences_widget_layout.addWidget(self.tw)
         self.preferences_widget.setLayout(self.preferences_widget_layout)
 
@@ -233,19 +477,19 @@ class NewWindow(QDialog):
 
         self.setLayout(layout)
 
-        self.dtime = str(datetime.datetime.now()).replace(' ','_').split('.')[0]
+        self.dtime = datetime.datetime.now().strftime('%Y-%m-%d_%H:%M:%S')
         
         print('TIME: ',self.dtime) 
 
-        session_files = [f for f in os.listdir() if f.endswith('.json')]
-
-        self.pname = str(self.doc).split()[1].replace("'",'').replace('>','').split('/')[-1].split('.')[0]
+        self.pname = os.path.splitext(os.path.basename(self.doc.path))[0]
         print(self.pname)
 
         self.session_name = ''
        
-        session_files = [f for f in os.listdir() if f.endswith('.json') and f.startswith(self.pname)]
-        if len(session_files) != 0:
+        # session files of this project, named <pname>_<YYYY-mm-dd>_<HH-MM-SS>.json
+        pattern = os.path.join(os.getcwd(), glob.escape(self.pname) + '_[0-9][0-9][0-9][0-9]-*.json')
+        self._session_files = [os.path.basename(p)[:-5] for p in glob.glob(pattern)]
+        if len(self._session_files) != 0:
             self.readChunkMemoryFromFileDialog()
 
         else:
@@ -255,139 +499,120 @@ class NewWindow(QDialog):
         self.exec()
         
         
-    def setChunkSpecificValues(self):
-    
-        trans = {'Reconstruction Uncertainty': 0,
-                 'Projection Accuracy': 1,
-                 'Reprojection Error': 2,
-                 'Reprojection Error (RMSE Minimization)': 3,
-                 }
-    
-        cl = self.chunk.label
-                       
-        for step in self.step_widgets:    
+    def setStepSpecificValues(self, step):
+
+        scale_fac = self._scale_fac[step]
+
+        settings = self._cur['tab_settings'][_STEP_TO_IX[step]]
+        widgets = self.step_widgets[step]
+         
+        # the chunk memory already holds these values, signals are blocked to avoid writing them back
+        for name, value in (('target_percent_slider', settings['target_percent']),
+                            ('target_threshold_slider', self.scale_up(settings['target_threshold'], scale_fac)),
+                            ('max_iter_slider', settings['num_iterations'])):
+            _set_if_changed(widgets[name], value, widgets[name].setValue, widgets[name].value)
+
+        for name, value in (('target_percent_ledit', settings['target_percent']),
+                            ('target_threshold_ledit', settings['target_threshold']),
+                            ('max_iter_ledit', settings['num_iterations']),
+                            ('tiepoint_accuracy_ledit', settings['tiepoint_accuracy'])):
+            _set_if_changed(widgets[name], str(value), widgets[name].setText, widgets[name].text)
         
-            _, _, scale_fac = self.parameters[step]
-             
-            self.step_widgets[step]['target_percent_slider'].setValue(self.chunk_memory[cl]['tab_settings'][trans[step]]['target_percent'])
-            self.step_widgets[step]['target_percent_ledit'].setText(str(self.chunk_memory[cl]['tab_settings'][trans[step]]['target_percent']))
-            
-            self.step_widgets[step]['target_threshold_slider'].setValue( self.scale_value(self.chunk_memory[cl]['tab_settings'][trans[step]]['target_threshold'], scale_fac, 'up') )
-            self.step_widgets[step]['target_threshold_ledit'].setText(str(self.chunk_memory[cl]['tab_settings'][trans[step]]['target_threshold']))
+        for key, cb in self.camera_check_boxes[step].items():
+            _set_if_changed(cb, settings[key], cb.setChecked, cb.isChecked)
 
-            self.step_widgets[step]['max_iter_slider'].setValue(self.chunk_memory[cl]['tab_settings'][trans[step]]['num_iterations'])
-            self.step_widgets[step]['max_iter_ledit'].setText(str(self.chunk_memory[cl]['tab_settings'][trans[step]]['num_iterations']))
 
-            self.step_widgets[step]['tiepoint_accuracy_ledit'].setText(str(self.chunk_memory[cl]['tab_settings'][trans[step]]['tiepoint_accuracy']))
-            
-            for key in self.camera_check_boxes[step]:
-                self.camera_check_boxes[step][key].setChecked(self.chunk_memory[cl]['tab_settings'][trans[step]][key]  )
+    def setChunkSpecificValues(self):
+                       
+        for step in self.step_widgets:    
+            self.setStepSpecificValues(step)
                 
+        self.tw.setUpdatesEnabled(False)
                                
         for tab_index in range(4):
-            step = 'Step ' + str(tab_index + 1)
 
-            
-            try:        
-                N_iter = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['Num. iterations']
-                self.tree_widgets[step]["Num. iterations"].setText(1, str(N_iter)) 
-            except ValueError:
-                self.tree_widgets[step]["Num. iterations"].setText(1, '') 
-                
-            try:
-                n_points_begin, n_points_left = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['Num. points'].replace('-','').replace('>', '').split()
-                self.tree_widgets[step]["Num. points"].setText(1, '{0: <10} ---> {1: <10}'.format(n_points_begin, n_points_left))
-            except ValueError:
-                self.tree_widgets[step]["Num. points"].setText(1, '')
-
-
-            try:
-                rms_begin, rms_final, _ = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['RMSE'].replace('-','').replace('>', '').split()
-                self.tree_widgets[step]["RMSE"].setText(1, '{0: <10} ---> {1: <10} (pix)'.format(round(float(rms_begin), 5), round(float(rms_final), 5)))
-            except ValueError:
-                self.tree_widgets[step]["RMSE"].setText(1, '')
-
-            try:    
-                seuw_begin, seuw_final, _ = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['SEUW'].replace('-','').replace('>', '').split()
-                self.tree_widgets[step]["SEUW"].setText(1, '{0: <10} ---> {1: <10}'.format(round(float(seuw_begin), 5), round(float(seuw_final), 5)))
-            except ValueError:
-                self.tree_widgets[step]["SEUW"].setText(1, '')
-
-            try:
-                cam_err_begin, cam_err_final, _ = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['Camera error'].replace('-','').replace('>', '').split()     
-                self.tree_widgets[step]["Camera error"].setText(1, '{0: <10} ---> {1: <10} (m)'.format(round(float(cam_err_begin), 6), round(float(cam_err_final), 6)))
-            except ValueError:
-                self.tree_widgets[step]["Camera error"].setText(1, '')
-                
+            cm = self._cur['tree_results'][tab_index]
+            tw = self.tree_widgets[_TREE_KEYS[tab_index]]
+
+            tw["Num. iterations"].setText(1, str(cm['Num. iterations']))
 
+            for label, ndigits, unit, ntokens in _TREE_FIELDS:
 
-            try:
-                mark_err_check_begin, mark_err_check_final, _ = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['Check point error'].replace('-','').replace('>', '').split()     
-                self.tree_widgets[step]['Check point error'].setText(1, '{0: <10} ---> {1: 10} (m)'.format(round(float(mark_err_check_begin), 6), round(float(mark_err_check_final), 6)))
-            except ValueError:
-                self.tree_widgets[step]['Check point error'].setText(1, '')
+                if label not in tw:
+                    continue
 
+                tokens = _parse_arrow(cm[label])
 
-            try:
-                mark_err_control_begin, mark_err_control_final, _ = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['Control point error'].replace('-','').replace('>', '').split()     
-                self.tree_widgets[step]['Control point error'].setText(1, '{0: <10} ---> {1: 10} (m)'.format(round(float(mark_err_control_begin), 6), round(float(mark_err_control_final), 6)))
-            except ValueError:
-                self.tree_widgets[step]['Control point error'].setText(1, '') 
+                # entry is empty if the step has not been executed yet
+                if len(tokens) != ntokens:
+                    tw[label].setText(1, '')
+                    continue
 
+                if ndigits is None:
+                    begin, final = int(tokens[0]), int(tokens[1])
+                else:
+                    begin, final = round(float(tokens[0]), ndigits), round(float(tokens[1]), ndigits)
 
-            try:     
-                scale_err_control_begin, scale_err_control_final, _ = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]["Control scale error"].replace('-','').replace('>', '').split()   
-                self.tree_widgets[step]["Control scale error"].setText(1, '{0: <10} ---> {1: <10} (m)'.format(round(float(scale_err_control_begin), 6), round(float(scale_err_control_final), 6)))
-            except ValueError:
-                self.tree_widgets[step]["Control scale error"].setText(1, '')
-                
-            try:     
-                scale_err_check_begin, scale_err_check_final, _ = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]["Check scale error"].replace('-','').replace('>', '').split()   
-                self.tree_widgets[step]["Check scale error"].setText(1, '{0: <10} ---> {1: <10} (m)'.format(round(float(scale_err_check_begin), 6), round(float(scale_err_check_final), 6)))
-            except ValueError:
-                self.tree_widgets[step]["Check scale error"].setText(1, '')
-                
-            try:
-                nproj_begin, nproj_final = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]["Num. proj. <100"].replace('-','').replace('>', '').split() 
-                self.tree_widgets[step]["Num. proj. <100"].setText(1, '{0: <10} ---> {1: <10}'.format(int(nproj_begin), int(nproj_final)))
-                
-            except ValueError:
-                self.tree_widgets[step]["Num. proj. <100"].setText(1, '')
-                print( self.chunk_memory[self.chunk.label]['tree_results'][tab_index]["Num. proj. <100"])
-
-
-            if step != "Step 4":
-                try:
-                    threshold_begin, threshold_final = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]["Level"].replace('-','').replace('>', '').split()   
-                    self.tree_widgets[step]["Level"].setText(1, '{0: <10} ---> {1: <10}'.format(round(float(threshold_begin), 6), round(float(threshold_final), 6)))
-                except ValueError:
-                    self.tree_widgets[step]["Level"].setText(1, '')
-
-                try:        
-                    rev_pts = self.chunk_memory[self.chunk.label]['tree_results'][tab_index]['Rev. it. / pts.']
-                    self.tree_widgets[step]['Rev. it. / pts.'].setText(1, rev_pts) 
-                except ValueError:
-                    self.tree_widgets[step]['Rev. it. / pts.'].setText(1, '') 
+                tw[label].setText(1, '{0: <10} ---> {1: <10}{2}'.format(begin, final, unit))
+
+            if 'Rev. it. / pts.' in tw:
+                tw['Rev. it. / pts.'].setText(1, cm['Rev. it. / pts.'])
+
+        self.tw.setUpdatesEnabled(True)
             
     
         
         
     def updateChunkMemory(self, step, kind, key, value):
     
-        trans = {'Reconstruction Uncertainty': 0,
-                 'Projection Accuracy': 1,
-                 'Reprojection Error': 2,
-                 'Reprojection Error (RMSE Minimization)': 3,
-                 }
-         
-       
-        ix = trans[step]
+        ix = _STEP_TO_IX[step]
     
-        cl = self.chunk.label
-        self.chunk_memory[cl][kind][ix][key] = value
+        self._cur[kind][ix][key] = value
         
         self.writeChunkMemory2File()
 
+    def _onCamCheck(self, step, key, cb, *_):
+        self.updateChunkMemory(step, 'tab_settings', key, cb.isChecked())
+
+    def ledit2ChunkMemory(self, step, key, ledit):
+
+        try:
+            value = float(ledit.text())
+        except ValueError:
+            return # incomplete input, e.g. an empty line edit
+
+        self.updateChunkMemory(step, 'tab_settings', key, value)
+
+    def _debounced(self, fn, delay=250):
+        '''returns a slot calling fn once its signal has not been emitted for delay ms'''
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(delay)
+        timer.timeout.connect(fn)
+
+        self._debounced_edits.append((timer, fn))
+
+        return lambda *_: timer.start()
+
+    def _flushPendingEdits(self):
+
+        for timer, fn in self._debounced_edits:
+            if timer.isActive():
+                timer.stop()
+                fn()
+
+    def done(self, result):
+
+        self._flushPendingEdits()
+
+        # write changes which are still pending before the window is closed
+        if self._write_timer.isActive():
+            self._write_timer.stop()
+            self._flushChunkMemory()
+
+        QDialog.done(self, result)
+
     def checkIfChunkInComboBox(self):
 
         if self.chunk.label not in self.chunk_memory:
@@ -402,110 +627,41 @@ class NewWindow(QDialog):
              
         for tab_index in range(4):
             
-            trans = {0:'Reconstruction Uncertainty',
-                     1:'Projection Accuracy',
-                     2:'Reprojection Error',
-                     3:'Reprojection Error (RMSE Minimization)',
-                 }
-                 
-            ix = trans[tab_index]
-                 
-            tp = self.default_values[ix]['target_percent']
-            tt = self.default_values[ix]['target_threshold']
-            ni = self.default_values[ix]['max_iter']
-            ta = self.default_values[ix]['tiepoint_accuracy']
+            ix = _IX_TO_STEP[tab_index]
+
+            settings = self._tab_settings_template.copy()
+            settings.update(target_percent=self.default_values[ix]['target_percent'],
+                            target_threshold=self.default_values[ix]['target_threshold'],
+                            num_iterations=self.default_values[ix]['max_iter'],
+                            tiepoint_accuracy=self.default_values[ix]['tiepoint_accuracy'],
+                            )
             
-            self.chunk_memory[chunk.label]['tab_settings'].update({tab_index : {'target_percent':tp,
-                                                                                                 'target_threshold':tt,
-                                                                                                 'num_iterations':ni,
-                                                                                                 'tiepoint_accuracy':ta,
-                                                                                                 'Fit f': self.camera_fit_dict['Fit f'],
-                                                                                                 'Fit k1':self.camera_fit_dict['Fit k1'],
-                                                                                                 'Fit k2':self.camera_fit_dict['Fit k2'],
-                                                                                                 'Fit k3':self.camera_fit_dict['Fit k3'],
-                                                                                                 'Fit k4':self.camera_fit_dict['Fit k4'],
-                                                                                                 'Fit cx, cy':self.camera_fit_dict['Fit cx, cy'],
-                                                                                                 'Fit p1':self.camera_fit_dict['Fit p1'],
-                                                                                                 'Fit p2':self.camera_fit_dict['Fit p2'],
-                                                                                                 'Fit b1':self.camera_fit_dict['Fit b1'],
-                                                                                                 'Fit b2':self.camera_fit_dict['Fit b2'],
-                                                                                                 'Adaptive camera model fitting':self.camera_fit_dict['Adaptive camera model fitting'],
-                                                                                                 'Estimate tie point covariance':self.camera_fit_dict['Estimate tie point covariance'],
-                                                                                                 'Fit additional corrections':self.camera_fit_dict['Fit additional corrections'],
-                                                                                                 },
-                                                                        })
-                                                                        
-    
-                                                                        
-            self.chunk_memory[chunk.label]['tree_results'].update({tab_index : {"Num. iterations" : '',
-                                                                                                "Num. points" : '',
-                                                                                                 "RMSE" : '',
-                                                                                                 "SEUW" : '',
-                                                                                                 "Camera error" : '',
-                                                                                                 "Check scale error" : '',
-                                                                                                 "Control scale error" : '',
-                                                                                                 "Check point error" : '',
-                                                                                                 "Control point error" : '',
-                                                                                                 "Num. proj. <100": '',
-                                                                                                 },
-                                                                        })
-
-
-            if tab_index != 4:
-               self.chunk_memory[chunk.label]['tree_results'][tab_index].update({ "Level" : '', "Rev. it. / pts.": ''})
-
-
-       
+            self.chunk_memory[chunk.label]['tab_settings'][tab_index] = settings
+            self.chunk_memory[chunk.label]['tree_results'][tab_index] = _TREE_RESULT_EMPTY.copy()
 
             
     def updateChunkMemoryTree(self):
     
-    
-        
         for tab_index in range(4):
-            key = 'Step ' + str(tab_index + 1)
-
-
-                     
-            self.chunk_memory[self.chunk.label]['tree_results'].update({tab_index : {"Num. iterations" : self.tree_widgets[key]["Num. iterations"].text(1),
-                                                                                "Num. points" : self.tree_widgets[key]["Num. points"].text(1),
-                                                                                "RMSE" : self.tree_widgets[key]["RMSE"].text(1),
-                                                                                "SEUW" : self.tree_widgets[key]["SEUW"].text(1),
-                                                                                "Camera error" : self.tree_widgets[key]["Camera error"].text(1),
-                                                                                "Control scale error" : self.tree_widgets[key]["Control scale error"].text(1),
-                                                                                "Check scale error" : self.tree_widgets[key]["Check scale error"].text(1),
-                                                                                "Control point error" : self.tree_widgets[key]["Control point error"].text(1),
-                                                                                "Check point error" : self.tree_widgets[key]["Check point error"].text(1),
-                                                                                "Num. proj. <100" : self.tree_widgets[key]["Num. proj. <100"].text(1),
-                                                                                
-                                                                                                 },
-                                                                        })
-
-
-
-
-            if key != "Step 4":
-                self.chunk_memory[self.chunk.label]['tree_results'][tab_index].update({"Level" : self.tree_widgets[key]["Level"].text(1),
-                                                                                       "Rev. it. / pts." : self.tree_widgets[key]["Rev. it. / pts."].text(1),
-                                                                                       })
-                                                                        
 
-            
+            cm = self._cur['tree_results'][tab_index]
+            tw = self.tree_widgets[_TREE_KEYS[tab_index]]
 
+            cm.update({label: tw[label].text(1) for label in _TREE_LABELS if label in tw})
                   
         self.writeChunkMemory2File()
 
-    def setDefaultValues(self, step):
+    def setDefaultValues(self, step, *_):
 
         
        
-        _, _, scale_fac = self.parameters[step]
+        scale_fac = self._scale_fac[step]
 
         self.step_widgets[step]['target_percent_ledit'].setText( str(self.default_values[step]['target_percent']) )
         self.step_widgets[step]['target_percent_slider'].setValue( self.default_values[step]['target_percent'] )
 
         self.step_widgets[step]['target_threshold_ledit'].setText( str(self.default_values[step]['target_threshold']) )
-        self.step_widgets[step]['target_threshold_slider'].setValue( self.scale_value(self.default_values[step]['target_threshold'], scale_fac, 'up' ))
+        self.step_widgets[step]['target_threshold_slider'].setValue( self.scale_up(self.default_values[step]['target_threshold'], scale_fac))
 
         self.step_widgets[step]['max_iter_ledit'].setText( str(self.default_values[step]['max_iter']) )
         self.step_widgets[step]['max_iter_slider'].setValue( self.default_values[step]['max_iter'] )
@@ -521,13 +677,71 @@ class NewWindow(QDialog):
         slider.setValue(val)
 
     def sliderValueChanged(self, value, ledit):
-        ledit.setText(str( value ))
+        # display only, the chunk memory is updated by sliderValueCommitted
+        with QSignalBlocker(ledit):
+            ledit.setText(str( value ))
+
+    def sliderValueCommitted(self, step, key, value, ledit):
+        self.sliderValueChanged(value, ledit)
+        self.updateChunkMemory(step, 'tab_settings', key, value)
+
+    def connectSlider(self, step, key, slider, ledit, slider2value):
+        '''dragging the slider only updates the line edit, the chunk memory is updated once the slider
+           is released or once keyboard and mouse wheel changes have settled'''
+
+        moved = qthrottled(lambda *_: self.sliderValueChanged(slider2value(), ledit), parent=slider)
+        slider.sliderMoved.connect(moved)
+
+        def commit():
+            moved.flush()
+            self.sliderValueCommitted(step, key, slider2value(), ledit)
+
+        slider.sliderReleased.connect(commit)
+
+        # keyboard and mouse wheel changes do not emit sliderReleased
+        notifier = DelayedNotification(slider, timeout=500)
+        notifier.notification.connect(commit)
+        self._debounced_edits.append((notifier, commit))
+
+        slider.actionTriggered.connect(lambda action: notifier.changed() if action != QAbstractSlider.SliderMove else None)
+
+    @staticmethod
+    def scale_down(value, factor):
+        return round(value*factor, 3)
+
+    @staticmethod
+    def scale_up(value, factor):
+        return round(value/factor, 3)
 
-    def scale_value(self, value, factor, direction):
-        if direction == 'down':
-            return round(value*factor, 3)
-        elif direction == 'up':
-            return round(value/factor, 3)
+
+    def _ensureTabBuilt(self, ix):
+
+        if ix < 0 or ix in self._tabs_built:
+            return
+
+        self._tabs_built.add(ix)
+
+        step = _IX_TO_STEP[ix]
+        settings = self._cur['tab_settings'][ix]
+
+        tab = self.makeStepWindow(step = step,
+                                  target_percent=settings['target_percent'],
+                                  target_threshold=settings['target_threshold'],
+                                  max_iter=settings['num_iterations'])
+
+        # the settings of the current chunk may differ from the defaults
+        self.setStepSpecificValues(step)
+        self.step_widgets[step]['run_button'].setEnabled(not self.auto_run_group_box.isChecked())
+
+        placeholder = self.tabwidget.widget(ix)
+        current = self.tabwidget.currentIndex()
+
+        with QSignalBlocker(self.tabwidget):
+            self.tabwidget.removeTab(ix)
+            self.tabwidget.insertTab(ix, tab, _TREE_KEYS[ix])
+            self.tabwidget.setCurrentIndex(current)
+
+        placeholder.deleteLater()
 
 
     def switchRunButtonsEnabledDisabled(self):
@@ -547,100 +761,57 @@ class NewWindow(QDialog):
         # 3    : scaling factor of threshold slider (enables usage of float numbers)  
 
         
-        tmin, tmax, scale_fac = self.parameters[step]
+        tmin, tmax = self._param_range[step]
+        scale_fac = self._scale_fac[step]
                         
         camera_fit_dict = self.camera_fit_dict
 
 
         self.camera_check_boxes.update({step:{}})
+        self._cam_check_slots[step] = {}
 
         camera_widget = QWidget()
         camera_widget_layout = QVBoxLayout()
         
 
         camera_group_box_1 = QGroupBox('General')
-        camera_group_box_1.setStyleSheet("QGroupBox { border: 1px solid lightgrey;}")
 
             
         for key in camera_fit_dict:
             cb = QCheckBox(key)
             cb.setChecked(camera_fit_dict[key])
-            cb.setStyleSheet("border: none;")
                                            
             self.camera_check_boxes[step].update({key:cb})
                                            
          
       
-        self.camera_check_boxes[step]['Fit f'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit f', self.camera_check_boxes[step]['Fit f'].isChecked() ))
-                                                                
-        self.camera_check_boxes[step]['Fit k1'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit k1', self.camera_check_boxes[step]['Fit k1'].isChecked() ))
-                                                                
-        self.camera_check_boxes[step]['Fit k2'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit k2', self.camera_check_boxes[step]['Fit k2'].isChecked() ))
-
-        self.camera_check_boxes[step]['Fit k3'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit k3', self.camera_check_boxes[step]['Fit k3'].isChecked() ))
-
-        self.camera_check_boxes[step]['Fit k4'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit k4', self.camera_check_boxes[step]['Fit k4'].isChecked() ))
-
-        self.camera_check_boxes[step]['Fit cx, cy'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit cx, cy', self.camera_check_boxes[step]['Fit cx, cy'].isChecked() ))
-
-        self.camera_check_boxes[step]['Fit p1'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit p1', self.camera_check_boxes[step]['Fit p1'].isChecked() ))
-
-        self.camera_check_boxes[step]['Fit p2'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit p2', self.camera_check_boxes[step]['Fit p2'].isChecked() ))
-
-        self.camera_check_boxes[step]['Fit b1'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit b1', self.camera_check_boxes[step]['Fit b1'].isChecked() ))
-
-        self.camera_check_boxes[step]['Fit b2'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit b2', self.camera_check_boxes[step]['Fit b2'].isChecked() ))                                                                
-                                        
-        self.camera_check_boxes[step]['Fit b2'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit b2', self.camera_check_boxes[step]['Fit b2'].isChecked() ))   
-                                                                
-        self.camera_check_boxes[step]['Adaptive camera model fitting'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Adaptive camera model fitting', self.camera_check_boxes[step]['Adaptive camera model fitting'].isChecked() ))  
-                                                                
-        self.camera_check_boxes[step]['Estimate tie point covariance'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Estimate tie point covariance', self.camera_check_boxes[step]['Estimate tie point covariance'].isChecked() ))                                               
-                                                                
-        self.camera_check_boxes[step]['Fit additional corrections'].stateChanged.connect(lambda: self.updateChunkMemory(step, 'tab_settings', 
-                                                                'Fit additional corrections', self.camera_check_boxes[step]['Fit additional corrections'].isChecked() ))                                  
+        for key, cb in self.camera_check_boxes[step].items():
+            slot = partial(self._onCamCheck, step, key, cb)
+            self._cam_check_slots[step][key] = slot
+            cb.stateChanged.connect(slot)
                                                                 
 
 
         camera_label = QLabel('Optimize Camera Alignment')
-        camera_label.setStyleSheet("QLabel{font-size: 9pt;}")
+        camera_label.setObjectName('headline')
 
    
 
         camera_group_box_1_layout = QGridLayout()
-        
-        labels = list(camera_fit_dict.keys())
 
-        for i, label in enumerate(labels[:5], start=1):
-             camera_group_box_1_layout.addWidget(self.camera_check_boxes[step][label], i, 0)
-
-        for i, label in enumerate(labels[5:10], start=1):
-             camera_group_box_1_layout.addWidget(self.camera_check_boxes[step][label], i, 1)
+        for key, row, col in _LAYOUT_MAP_GRID:
+             camera_group_box_1_layout.addWidget(self.camera_check_boxes[step][key], row, col)
 
         camera_group_box_1.setLayout(camera_group_box_1_layout)
    
 
         camera_group_box_2 = QGroupBox('Advanced')
-        camera_group_box_2.setStyleSheet("QGroupBox { border: 1px solid lightgrey;}")
         
 
         camera_group_box_2_layout = QVBoxLayout()
 
-        for i, label in enumerate(labels[10:], start=6):
-            camera_group_box_2_layout.addWidget(self.camera_check_boxes[step][label])
+        for key in _LAYOUT_MAP_ADVANCED:
+            camera_group_box_2_layout.addWidget(self.camera_check_boxes[step][key])
 
         camera_group_box_2.setLayout(camera_group_box_2_layout)
 
@@ -658,16 +829,10 @@ class NewWindow(QDialog):
 
 
         target_percent_label = QLabel('Target percent:     ')
-        target_percent_label.setStyleSheet("border: none;") 
 
 
         target_percent_ledit = QLineEdit(str(target_percent))
-        target_percent_ledit.textChanged.connect(lambda: self.updateChunkMemory(step, 
-                                                                                'tab_settings', 
-                                                                                'target_percent', 
-                                                                                float(target_percent_ledit.text()),
-                                                                                ),
-                                                )
+        target_percent_ledit.textChanged.connect(self._debounced(lambda v=target_percent_ledit: self.ledit2ChunkMemory(step, 'target_percent', v)))
 
 
 
@@ -679,35 +844,22 @@ class NewWindow(QDialog):
             target_threshold_label = QLabel('Target RMSE:           ')
 
 
-        target_threshold_label.setStyleSheet("border: none;")
 
         target_threshold_ledit = QLineEdit(str(target_threshold))
-        target_threshold_ledit.textChanged.connect(lambda: self.updateChunkMemory(step, 
-                                                                                'tab_settings', 
-                                                                                'target_threshold', 
-                                                                                float(target_threshold_ledit.text()),
-                                                                                ),
-                                                )
+        target_threshold_ledit.textChanged.connect(self._debounced(lambda v=target_threshold_ledit: self.ledit2ChunkMemory(step, 'target_threshold', v)))
 
         self.step_widgets[step].update({'target_threshold_ledit':target_threshold_ledit})
 
 
         max_iter_label = QLabel('Num. of iterations:')
-        max_iter_label.setStyleSheet("border: none;")
     
         max_iter_ledit = QLineEdit(str(max_iter))
-        max_iter_ledit.textChanged.connect(lambda: self.updateChunkMemory(step, 
-                                                                          'tab_settings', 
-                                                                          'num_iterations', 
-                                                                          float( max_iter_ledit.text()),
-                                                                          ),
-                                           )
+        max_iter_ledit.textChanged.connect(self._debounced(lambda v=max_iter_ledit: self.ledit2ChunkMemory(step, 'num_iterations', v)))
         
         self.step_widgets[step].update({'max_iter_ledit':max_iter_ledit})
 
         target_percent_slider = QSlider(Qt.Horizontal)
 
-        target_percent_slider.setStyleSheet("border: none;")
 
         
 
@@ -716,9 +868,8 @@ class NewWindow(QDialog):
 
         target_percent_slider.setValue( float(self.step_widgets[step]['target_percent_ledit'].text()) )
 
-        target_percent_slider.sliderMoved.connect(lambda: self.sliderValueChanged( float(target_percent_slider.value()), 
-                                                          self.step_widgets[step]['target_percent_ledit']),
-                                                  )
+        self.connectSlider(step, 'target_percent', target_percent_slider, self.step_widgets[step]['target_percent_ledit'],
+                           lambda: float(target_percent_slider.value()))
 
 
         self.step_widgets[step].update( {'target_percent_slider':target_percent_slider} )
@@ -733,7 +884,6 @@ class NewWindow(QDialog):
 
         target_threshold_slider = QSlider(Qt.Horizontal)
 
-        target_threshold_slider.setStyleSheet("border: none;")
 
         
         
@@ -742,30 +892,27 @@ class NewWindow(QDialog):
 
         target_threshold_slider.setValue( float(self.step_widgets[step]['target_threshold_ledit'].text()) / scale_fac )
 
-        target_threshold_slider.sliderMoved.connect(lambda: self.sliderValueChanged(  float(self.scale_value(target_threshold_slider.value(), scale_fac, 'down')), 
-                                                                                      self.step_widgets[step]['target_threshold_ledit']),
-                                                    )
+        self.connectSlider(step, 'target_threshold', target_threshold_slider, self.step_widgets[step]['target_threshold_ledit'],
+                           lambda: float(self.scale_down(target_threshold_slider.value(), scale_fac)))
 
 
         self.step_widgets[step].update( {'target_threshold_slider':target_threshold_slider} )
 
 
         self.step_widgets[step]['target_threshold_ledit'].editingFinished.connect(lambda: self.setSliderValue( self.step_widgets[step]['target_threshold_slider'], 
-                                                                                                               self.scale_value(float(self.step_widgets[step]['target_threshold_ledit'].text()), scale_fac, 'up'),
+                                                                                                               self.scale_up(float(self.step_widgets[step]['target_threshold_ledit'].text()), scale_fac),
                                                                                                               ),
                                                                                   )
 
 
         max_iter_slider = QSlider(Qt.Horizontal)
 
-        max_iter_slider.setStyleSheet("border: none;")
         max_iter_slider.setMinimum(0)
         max_iter_slider.setMaximum(200)
         max_iter_slider.setValue( float(self.step_widgets[step]['max_iter_ledit'].text()) )
 
-        max_iter_slider.sliderMoved.connect(lambda: self.sliderValueChanged( int(max_iter_slider.value()), 
-                                                                             self.step_widgets[step]['max_iter_ledit']),
-                                            )
+        self.connectSlider(step, 'num_iterations', max_iter_slider, self.step_widgets[step]['max_iter_ledit'],
+                           lambda: int(max_iter_slider.value()))
 
 
         self.step_widgets[step].update( {'max_iter_slider':max_iter_slider} )
@@ -781,7 +928,7 @@ class NewWindow(QDialog):
         button.setFixedSize(QtCore.QSize(5, 20))
 
 
-        button.clicked.connect(lambda: self.runButtonClicked(step))
+        button.clicked.connect(partial(self.runButtonClicked, step))
 
                                                            
         button.clicked.connect(self.updateChunkMemoryTree)
@@ -790,14 +937,11 @@ class NewWindow(QDialog):
         default_button.setFixedSize(QtCore.QSize(5, 20))
 
 
-        default_button.clicked.connect(lambda: self.setDefaultValues(step) )
+        default_button.clicked.connect(partial(self.setDefaultValues, step))
 
         self.step_widgets[step].update( {'run_button':button} )
 
     
-        step_widget = QWidget() 
-        step_widget.setStyleSheet("border: none;")
- 
         step_widget_layout = QVBoxLayout()
         step_widget_layout.setSpacing(25)
         step_widget_layout.setMargin(15)
@@ -832,13 +976,12 @@ class NewWindow(QDialog):
         step_widget_layout.addLayout(max_iter_layout)
 
         emptyline = QLabel(' ')
-        emptyline.setStyleSheet("border: none;")
 
         step_widget_layout.addWidget(emptyline) 
  
      
         headline = QLabel(step)
-        headline.setStyleSheet("QLabel{font-size: 9pt;}")
+        headline.setObjectName('headline')
        
 
         crd_acc_group_box =  QGroupBox('Image Coordinates Accuracy')
@@ -846,12 +989,7 @@ class NewWindow(QDialog):
 
         crd_acc_label = QLabel('Tie point accuracy (pix):')
         crd_acc_ledit = QLineEdit(str(self.chunk.tiepoint_accuracy))
-        crd_acc_ledit.textChanged.connect(lambda: self.updateChunkMemory(step, 
-                                                                         'tab_settings', 
-                                                                         'tiepoint_accuracy', 
-                                                                          float( crd_acc_ledit.text()),
-                                                                          ),
-                                           )
+        crd_acc_ledit.textChanged.connect(self._debounced(lambda v=crd_acc_ledit: self.ledit2ChunkMemory(step, 'tiepoint_accuracy', v)))
         
 
     
@@ -863,7 +1001,6 @@ class NewWindow(QDialog):
         crd_acc_group_box_layout.addWidget(crd_acc_ledit)
 
         crd_acc_group_box.setLayout(crd_acc_group_box_layout)
-        crd_acc_group_box.setStyleSheet("QGroupBox { border: 1px solid lightgrey;}")
         crd_acc_group_box.setCheckable(True)
         crd_acc_group_box.setChecked(False)
 
@@ -908,44 +1045,55 @@ class NewWindow(QDialog):
         
     def writeChunkMemory2File(self):
 
+       # the actual write is deferred, see _flushChunkMemory
+       self._write_timer.start()
+
+    def _flushChunkMemory(self):
+
        if self.session_name == '':
            self.newSessionName()
 
        fname = self.session_name + '.json'
 
        current_doc = Metashape.app.document.path
-       current_dir = os.path.dirname(current_doc)
+       if current_doc != self._session_doc:
+           self._session_doc = current_doc
+           self._session_dir = os.path.dirname(current_doc)
        
        
-       with open(current_dir + "/" + fname, "w") as f:
-           json.dump(self.chunk_memory, f, indent=4)
+       path = self._session_dir + "/" + fname
+       payload = _dumps(self.chunk_memory)
+
+       # skipping the write if the file already holds this content
+       payload_hash = hash((path, payload))
+       if payload_hash == self._last_payload_hash:
+           return
+
+       with open(path, "wb") as f:
+           f.write(payload)
+
+       self._last_payload_hash = payload_hash
 
            
     def readChunkMemoryFromFile(self):
 
         fname = self.session_name + '.json'
-        with open(fname, "r") as f:
+        with open(fname, "r", encoding='utf-8') as f:
             mem = json.load(f)
             
         # json turns every key into strings
         # here the key corresponding to the tab indices are changed to integers        
-        new_mem = deepcopy(mem)
-        for ch in mem:
-            for kind in mem[ch]:
-                for key in mem[ch][kind].keys():
-                    new_mem[ch][kind][int(key)] = mem[ch][kind][key]
-                    del new_mem[ch][kind][key]
+        new_mem = {ch: {kind: {int(key): value for key, value in d.items()} 
+                        for kind, d in kinds.items()} 
+                   for ch, kinds in mem.items()}
 
         self.chunk_memory = new_mem
-
+        self._refreshCur()
             
         self.setChunkSpecificValues()
 
     def convertFromComboBox2SessionName(self, text):
-        d, t = text.replace('Date:', '').replace('Time:','').split()
-        
-        d = d.replace('/', '-')
-        t = t.replace(':', '-')
+        _, d, _, t = text.translate(_FROM_DISPLAY).split()
 
         out = self.pname + '_' + d + '_' + t 
         
@@ -959,7 +1107,7 @@ class NewWindow(QDialog):
 
     def newSessionName(self):
 
-        dt = str(datetime.datetime.now()).replace(' ','_').split('.')[0].replace(':', '-')
+        dt = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
 
         self.session_name = self.pname + '_' + dt 
 
@@ -967,26 +1115,19 @@ class NewWindow(QDialog):
     
     def readChunkMemoryFromFileDialog(self):
 
-        session_files = [f[:-5] for f in os.listdir() if f.endswith('.json') and f.split('-')[0][:-5] == self.pname ]
-
         self.session_combo_box = QComboBox()
 
-        snames = {}       
-        for f in sorted(session_files, reverse=True):
-        
-            st = f.replace(self.pname, "")
-
+        # the names end with date and time, so the newest session comes first
+        n = len(self.pname) + 1
+        labels = []
+        for f in sorted(self._session_files, reverse=True):
 
-            if st.split('_')[0] == '':
-                _, date, time = st.split('_')
-            else:
-                date, time = st.split('_')
+            date, time = f[n:].split('_')
 
+            labels.append('Date: ' + date.replace('-', '/') + '     Time: ' + time.replace('-', ':'))
 
-            date = date.replace('-', '/')
-            time = time.replace('-', ':')
-            
-            self.session_combo_box.addItem('Date: ' + date + '     Time: ' + time)
+        with QSignalBlocker(self.session_combo_box):
+            self.session_combo_box.addItems(labels)
 
   
     
@@ -1048,15 +1189,18 @@ class NewWindow(QDialog):
         point_cloud = self.chunk.tie_points
         points = point_cloud.points
         npoints = len(points)
-        projections = self.chunk.tie_points.projections
+        projections = point_cloud.projections
         err_sum = 0
         num = 0
-        maxe = 0
 
-        point_ids = [-1] * len(point_cloud.tracks)
-        point_errors = dict()
-        for point_id in range(0, npoints):
-            point_ids[points[point_id].track_id] = point_id
+        # point attributes are fetched once instead of once per projection
+        track_ids = np.fromiter((p.track_id for p in points), dtype=np.int64, count=npoints)
+        valid = np.fromiter((p.valid for p in points), dtype=bool, count=npoints)
+        coords = [p.coord for p in points]
+
+        # index of the valid point of each track, -1 for tracks without valid point
+        point_ids = np.full(len(point_cloud.tracks), -1, dtype=np.int64)
+        point_ids[track_ids[valid]] = np.flatnonzero(valid)
 
         for camera in self.chunk.cameras:
             if not camera.transform:
@@ -1065,26 +1209,18 @@ class NewWindow(QDialog):
             if not camera.enabled:
                 continue
 
-            for proj in projections[camera]:
-                track_id = proj.track_id
-                point_id = point_ids[track_id]
-                if point_id < 0:
-                    continue
+            error = camera.error
 
-                point = points[point_id]
-                if not point.valid:
-                    continue
+            camera_projections = projections[camera]
+            proj_track_ids = np.fromiter((proj.track_id for proj in camera_projections), dtype=np.int64, count=len(camera_projections))
 
-                error = camera.error(point.coord, proj.coord).norm() ** 2
-                err_sum += error
-                num += 1
+            proj_point_ids = point_ids[proj_track_ids]
+            proj_ix = np.flatnonzero(proj_point_ids >= 0)
 
-                if point_id not in point_errors.keys():
-                    point_errors[point_id] = [error]
-                else:
-                    point_errors[point_id].append(error)
+            for i, point_id in zip(proj_ix.tolist(), proj_point_ids[proj_ix].tolist()):
+                err_sum += error(coords[point_id], camera_projections[i].coord).norm2()
 
-                if error > maxe: maxe = error
+            num += len(proj_ix)
 				
         sigma = math.sqrt(err_sum / num)
 
@@ -1092,8 +1228,14 @@ class NewWindow(QDialog):
 
     def askCorrectChunkWindow(self):
 
+        if self._chunk_confirmed and self._chunk_confirmed_id == self.chunk.key:
+            self.rval = True
+            return
+
         def yesClicked():
             self.rval =  True
+            self._chunk_confirmed = True
+            self._chunk_confirmed_id = self.chunk.key
         
         def noClicked():
             self.rval = False
@@ -1124,6 +1266,8 @@ class NewWindow(QDialog):
 
     def runAllButtonClicked(self):
 
+        self._flushPendingEdits()
+
         self.rval = None
         self.askCorrectChunkWindow()
 
@@ -1132,7 +1276,9 @@ class NewWindow(QDialog):
         
         self.runAllSteps()
 
-    def runButtonClicked(self, step):
+    def runButtonClicked(self, step, *_):
+
+        self._flushPendingEdits()
 
         self.rval = None
         self.askCorrectChunkWindow()
@@ -1140,10 +1286,12 @@ class NewWindow(QDialog):
         if not self.rval:
             return
         
+        settings = self._settings[step]
+
         self.executeStep(step = step,
-                             target_percent = float(self.step_widgets[step]['target_percent_ledit'].text()), 
-                             target_threshold = float(self.step_widgets[step]['target_threshold_ledit'].text()), 
-                             max_iter = float(self.step_widgets[step]['max_iter_ledit'].text()),
+                             target_percent = settings['target_percent'], 
+                             target_threshold = settings['target_threshold'], 
+                             max_iter = settings['num_iterations'],
                              )
 
 
@@ -1155,11 +1303,15 @@ class NewWindow(QDialog):
         fin = False
         threshold = None
 
+        # the tie points may have been edited since the last run
+        self._proj_cache.clear()
+        self._proj_tids_key = None
+
         npoint_list = []
 
         initial_tiepoint_accuracy = self.chunk.tiepoint_accuracy 
 
-        self.chunk.tiepoint_accuracy = float(self.tiepoint_ledits[step].text())
+        self.chunk.tiepoint_accuracy = float(self._settings[step]['tiepoint_accuracy'])
 
         criteria = {'Reconstruction Uncertainty' : Metashape.TiePoints.Filter.ReconstructionUncertainty,
                     'Projection Accuracy' : Metashape.TiePoints.Filter.ProjectionAccuracy,
@@ -1171,20 +1323,38 @@ class NewWindow(QDialog):
 
 
 
-        fit_f = self.camera_check_boxes[step]['Fit f'].isChecked()
-        fit_cx= self.camera_check_boxes[step]['Fit cx, cy'].isChecked() 
-        fit_cy= self.camera_check_boxes[step]['Fit cx, cy'].isChecked()
-        fit_b1= self.camera_check_boxes[step]['Fit b1'].isChecked() 
-        fit_b2= self.camera_check_boxes[step]['Fit b2'].isChecked() 
-        fit_k1= self.camera_check_boxes[step]['Fit k1'].isChecked()
-        fit_k2= self.camera_check_boxes[step]['Fit k2'].isChecked() 
-        fit_k3= self.camera_check_boxes[step]['Fit k3'].isChecked() 
-        fit_k4= self.camera_check_boxes[step]['Fit k4'].isChecked()
-        fit_p1= self.camera_check_boxes[step]['Fit p1'].isChecked()
-        fit_p2= self.camera_check_boxes[step]['Fit p2'].isChecked() 
-        fit_corrections= self.camera_check_boxes[step]['Fit additional corrections'].isChecked()
-        adaptive_fitting= self.camera_check_boxes[step]['Adaptive camera model fitting'].isChecked() 
-        tiepoint_covariance= self.camera_check_boxes[step]['Estimate tie point covariance'].isChecked()
+        cbs = self.camera_check_boxes[step]
+
+        fit_f = cbs[_FIT_F].isChecked()
+        fit_cx= cbs[_FIT_CXCY].isChecked() 
+        fit_cy= fit_cx
+        fit_b1= cbs[_FIT_B1].isChecked() 
+        fit_b2= cbs[_FIT_B2].isChecked() 
+        fit_k1= cbs[_FIT_K1].isChecked()
+        fit_k2= cbs[_FIT_K2].isChecked() 
+        fit_k3= cbs[_FIT_K3].isChecked() 
+        fit_k4= cbs[_FIT_K4].isChecked()
+        fit_p1= cbs[_FIT_P1].isChecked()
+        fit_p2= cbs[_FIT_P2].isChecked() 
+        fit_corrections= cbs[_FIT_CORRECTIONS].isChecked()
+        adaptive_fitting= cbs[_ADAPTIVE_FITTING].isChecked() 
+        tiepoint_covariance= cbs[_TIEPOINT_COVARIANCE].isChecked()
+
+        # arguments of every camera optimization within this step
+        optimize_kwargs = dict(fit_f = fit_f,
+                               fit_cx= fit_cx, 
+                               fit_cy= fit_cy,
+                               fit_b1= fit_b1, 
+                               fit_b2= fit_b2, 
+                               fit_k1= fit_k1,
+                               fit_k2= fit_k2, 
+                               fit_k3= fit_k3, 
+                               fit_k4= fit_k4,
+                               fit_p1= fit_p1,
+                               fit_p2= fit_p2, 
+                               fit_corrections= fit_corrections,
+                               adaptive_fitting= adaptive_fitting, 
+                               tiepoint_covariance= tiepoint_covariance)
 
         tf = {True:'x', False:' '}
 
@@ -1214,79 +1384,88 @@ class NewWindow(QDialog):
                      
         print(message)
 
+        # bound to a local, it is dereferenced several times per iteration
+        chunk = self.chunk
+
+        # RMSE of the current tie point cloud, only recomputed after the cloud has been changed
+        rms, rms_dirty = None, True
+
+        def currentRMS():
+            nonlocal rms, rms_dirty
+            if rms_dirty:
+                rms, rms_dirty = self.calcRMS(), False
+            return rms
+
+        # filter of the current tie point cloud, only rebuilt after the cloud has been changed
+        f, f_stale = None, True
+
+        def currentFilter():
+            nonlocal f, f_stale
+            if f_stale:
+                f = Metashape.TiePoints.Filter()
+                f.init(chunk, criterion = criterion)
+                f_stale = False
+            return f
+
         for it in range(int(max_iter)):
 
-            points = self.chunk.tie_points.points
+            points = chunk.tie_points.points
 
-            f = Metashape.TiePoints.Filter()
-            f.init(self.chunk, criterion = criterion) 
-            list_values = f.values
-            list_values_valid = list()
-        
-            for i in range(len(list_values)):
-       
-                if points[i].valid:
-                    list_values_valid.append(list_values[i])
+            f = currentFilter()
+            list_values = np.asarray(f.values, dtype=np.float64)
+            valid = np.fromiter((p.valid for p in points), dtype=bool, count=len(points))
 
-            list_values_valid.sort()
+            list_values_valid = np.sort(list_values[valid])
 
             if it == 0:
                 n_points_begin = len(list_values_valid)
-                rms_begin = self.calcRMS()
-                seuw_begin = float(self.chunk.meta['OptimizeCameras/sigma0'])
+                rms_begin = currentRMS()
+                self._sigma0 = float(chunk.meta['OptimizeCameras/sigma0'])
+                seuw_begin = self._sigma0
                 cam_err_begin = self.calcTotalCameraError()
-                scale_err_check_begin = self.calcScaleBarErrorCheck()
-                scale_err_control_begin = self.calcScaleBarErrorControl()
+                scale_err_control_begin, scale_err_check_begin = self._calcScalebarErrors()
                 nproj_begin = self.getNumProjectionsLowerThan()
-                mark_err_control_begin = self.calcMarkerErrorControlPoint()
-                mark_err_check_begin = self.calcMarkerErrorCheckPoint()
+                mark_err_control_begin, mark_err_check_begin = self._calcMarkerErrors()
                 
-                threshold_begin = max(list_values_valid)
-
-                # number of points above threshold at the beginning
-                n_0 = len([val for val in list_values_valid if val > target_threshold])
+                threshold_begin = float(list_values_valid[-1])
 
 
         
             xx = len(list_values_valid)
 
-            mfac = 100
             if step != 'Reprojection Error (RMSE Minimization)':
-                
-                for n in reversed(range( (100*mfac - (int(target_percent)*mfac)  ) , 100*mfac, 1)):
 
-                    n = n / mfac
-                    target = int(len(list_values_valid) * (n / 100) )
+                values = np.asarray(list_values_valid)
+                nvalues = values.size
 
-                
-                    threshold = list_values_valid[target]
-                
-              
-                    if threshold < target_threshold:
+                # lowest filter level allowed, i.e. at most target percent of the points are removed
+                min_ix = int(nvalues * (100 - int(target_percent)) / 100)
 
-                        try:
-                            target = int(len(list_values_valid) * (n+(1/mfac)) / 100)
-                            threshold = list_values_valid[target]
-                            print('Iteration: ', it + 1, '   Filter level before camera optimization: ', threshold)
-                            fin = True
-                            break
+                # first value not below the target threshold
+                ix = int(np.searchsorted(values, target_threshold, side='left'))
 
-                        except IndexError:
-                            threshold = None
-                            fin = True
+                if ix <= min_ix:
+                    # target threshold cannot be reached within target percent
+                    threshold = float(values[min_ix]) if min_ix < nvalues else None
 
-                    if n%mfac == 0: 
-                        print('Iteration: ', it + 1, '   Filter level before camera optimization: ', threshold)
+                elif ix < nvalues:
+                    threshold = float(values[ix])
+                    fin = True
 
+                else:
+                    # all points are already below the target threshold
+                    threshold = None
+                    fin = True
+
+                print('Iteration: ', it + 1, '   Filter level before camera optimization: ', threshold)
 
-            else:
 
-                rms = self.calcRMS()
+            else:
  
-                if rms > target_threshold:
+                if currentRMS() > target_threshold:
 
                     target = int(len(list_values_valid) * ((100-target_percent) / 100) )
-                    threshold = list_values_valid[target]
+                    threshold = float(list_values_valid[target])
 
                      
 
@@ -1295,27 +1474,19 @@ class NewWindow(QDialog):
                 f.selectPoints(threshold) 
                 f.removePoints(threshold) 
 
-                self.chunk.optimizeCameras(fit_f = self.camera_check_boxes[step]['Fit f'].isChecked(),
-                                           fit_cx= self.camera_check_boxes[step]['Fit cx, cy'].isChecked(), 
-                                           fit_cy= self.camera_check_boxes[step]['Fit cx, cy'].isChecked(),
-                                           fit_b1= self.camera_check_boxes[step]['Fit b1'].isChecked(), 
-                                           fit_b2= self.camera_check_boxes[step]['Fit b2'].isChecked(), 
-                                           fit_k1= self.camera_check_boxes[step]['Fit k1'].isChecked(),
-                                           fit_k2= self.camera_check_boxes[step]['Fit k2'].isChecked(), 
-                                           fit_k3= self.camera_check_boxes[step]['Fit k3'].isChecked(), 
-                                           fit_k4= self.camera_check_boxes[step]['Fit k4'].isChecked(),
-                                           fit_p1= self.camera_check_boxes[step]['Fit p1'].isChecked(),
-                                           fit_p2= self.camera_check_boxes[step]['Fit p2'].isChecked(), 
-                                           fit_corrections= self.camera_check_boxes[step]['Fit additional corrections'].isChecked(),
-                                           adaptive_fitting= self.camera_check_boxes[step]['Adaptive camera model fitting'].isChecked(), 
-                                           tiepoint_covariance= self.camera_check_boxes[step]['Estimate tie point covariance'].isChecked())
+                chunk.optimizeCameras(**optimize_kwargs)
+                self._sigma0 = float(chunk.meta['OptimizeCameras/sigma0'])
+                rms_dirty = True
+                f_stale = True
+                self._proj_cache.clear()
 
                 if fin == True:
 
-                    f = Metashape.TiePoints.Filter()
-                    f.init(self.chunk, criterion = criterion) 
+                    f = currentFilter()
+
+                    exceeded = any(v > target_threshold for v in f.values)
 
-                    if max(f.values) > target_threshold:
+                    if exceeded:
 
                         print('Approached filter level of current iteration: ', max(f.values))
                         fin = False
@@ -1327,17 +1498,11 @@ class NewWindow(QDialog):
                 #if more than 10 points can be removed from the point list, the process starts anew (variable fin is set to False)
  
 
-                list_values = f.values
-                list_values_valid = list()
-        
-                for i in range(len(list_values)):       
-                    if points[i].valid:
-                        list_values_valid.append(list_values[i])
-
-                list_values_valid.sort()
- 
                 if step != 'Reprojection Error (RMSE Minimization)':
-                    npoints = len([val for val in list_values_valid if val > target_threshold])
+                    list_values = np.asarray(f.values, dtype=np.float64)
+                    valid = np.fromiter((p.valid for p in points), dtype=bool, count=len(points))
+
+                    npoints = int(np.count_nonzero(list_values[valid] > target_threshold))
                     npoint_list.append(npoints)
 
                     print('Number of points above target threshold: ', npoints)
@@ -1351,170 +1516,132 @@ class NewWindow(QDialog):
 
             if step == 'Reprojection Error (RMSE Minimization)':
 
-                f = Metashape.TiePoints.Filter()
-                f.init(self.chunk, criterion = criterion) 
+                f = currentFilter()
  
-                rms = self.calcRMS()     
-              
-                print('Iteration: ', it + 1, '   RMSE: ', rms)
+                print('Iteration: ', it + 1, '   RMSE: ', currentRMS())
             
                             
-                if rms <= target_threshold:
+                if currentRMS() <= target_threshold:
                      fin = True
                   
             if fin: 
-                n_points_left = len([p for p in self.chunk.tie_points.points if p.valid])
-                self.rms = self.calcRMS()
-
-                threshold_final = max(f.values)#
-                
-                differences = [ npoint_list[i] - npoint_list[i-1] for i in range(1, len(npoint_list) )]
-                n_reverse = len([ d for d in differences if d >= 0 ])
-
-                sum_positive_diff = sum([ d for d in differences if d >= 0 ])
-
-                rev_pts = str(n_reverse) + ' / ' + str(sum_positive_diff)
-
-                         
-                print("\nFinished {} in {} iterations".format(step, it+1))
-                if step !=  'Reprojection Error (RMSE Minimization)':
-                    print('Change in numbers of points above the threshold for each iteration: ', differences)
-                    print('Number of reversals (iterations with >= 0 points as listed above): ', n_reverse)
-                    print('Cummulative number of reversal points: ', sum_positive_diff)                    
-                    print("Approached filter level: {}".format(threshold_final))
-                else:
-                    print("Final RMSE: {}".format(self.rms))
-
-                print("Remaining tie points: {} out of {} ({} %)".format(n_points_left, n_points_begin, round((n_points_left/n_points_begin)*100 )))
-
                 break
 
 
-        # check if max. iteration is reached before target threshold is reached
-        # if so, define the missing variables needed to stop the routine 
-        
-        if it == (max_iter-1) and fin == False:
-            n_points_left = len([p for p in self.chunk.tie_points.points if p.valid])
+        # fin is still False if max. iteration is reached before target threshold is reached
 
-            f = Metashape.TiePoints.Filter()
-            f.init(self.chunk, criterion = criterion)
+        n_points_left = sum(1 for p in chunk.tie_points.points if p.valid)
+        self.rms = currentRMS()
 
-            threshold_final = max(f.values)
-            
+        if not fin:
+            f = currentFilter()
 
-            differences = [ npoint_list[i] - npoint_list[i-1] for i in range(1, len(npoint_list) )]
-            n_reverse = len([ d for d in differences if d >= 0 ])
+        threshold_final = max(f.values)
 
-            sum_positive_diff = sum([ d for d in differences if d >= 0 ])
+        differences = np.diff(npoint_list)
+        positive_diff = differences[differences >= 0]
+        n_reverse = int(positive_diff.size)
 
-            rev_pts = str(n_reverse) + ' / ' + str(sum_positive_diff)
-                   
+        sum_positive_diff = int(positive_diff.sum())
 
-            self.rms = self.calcRMS()
-            print('Insuffiecient number of iterations to approach target threshold.\n')
+        rev_pts = f'{n_reverse} / {sum_positive_diff}'
 
-            print("\nFinished {} in {} iterations".format(step, it+1))
-            if step !=  'Reprojection Error (RMSE Minimization)':
-                print("Approached filter threshold: {}".format(threshold_final))
-            else:
-                print("Final RMSE: {}".format(self.rms))
+        if not fin:
+            print('Insuffiecient number of iterations to approach target threshold.\n')
 
-            print("Remaing tie points: {} out of {} ({} %)".format(n_points_left, n_points_begin, round((n_points_left/n_points_begin)*100 )))
+        print("\nFinished {} in {} iterations".format(step, it+1))
+        if step !=  'Reprojection Error (RMSE Minimization)':
+            print('Change in numbers of points above the threshold for each iteration: ', differences.tolist())
+            print('Number of reversals (iterations with >= 0 points as listed above): ', n_reverse)
+            print('Cummulative number of reversal points: ', sum_positive_diff)                    
+            print("Approached filter level: {}".format(threshold_final))
+        else:
+            print("Final RMSE: {}".format(self.rms))
+
+        print("Remaining tie points: {} out of {} ({} %)".format(n_points_left, n_points_begin, round((n_points_left/n_points_begin)*100 )))
+
+        mark_err_control_final, mark_err_check_final = self._calcMarkerErrors()
+        scale_err_control_final, scale_err_check_final = self._calcScalebarErrors()
+
+        report = StepReport(step = step, 
+                            n_iter = it+1, 
+                            n_points_begin = n_points_begin, n_points_left = n_points_left, 
+                            rms_begin = rms_begin, rms_final = self.rms, 
+                            seuw_begin = seuw_begin, seuw_final = self._sigma0, 
+                            cam_err_begin = cam_err_begin, cam_err_final = self.calcTotalCameraError(),
+                            nproj_begin = nproj_begin, nproj_final = self.getNumProjectionsLowerThan(),
+                            mark_err_control_begin = mark_err_control_begin, mark_err_control_final = mark_err_control_final,
+                            mark_err_check_begin = mark_err_check_begin, mark_err_check_final = mark_err_check_final,
+                            scale_err_control_begin = scale_err_control_begin, scale_err_control_final = scale_err_control_final,
+                            scale_err_check_begin = scale_err_check_begin, scale_err_check_final = scale_err_check_final,
+                            threshold_begin = threshold_begin, threshold_final = threshold_final,
+                            rev_pts = rev_pts,
+                            )
 
-             
         # updating entries of the tree widget
-        self.updateTreeEntries( step, 
-                               (it+1), 
-                                n_points_begin, n_points_left, 
-                                rms_begin, self.rms, 
-                                seuw_begin, float(self.chunk.meta['OptimizeCameras/sigma0']), 
-                                cam_err_begin, self.calcTotalCameraError(),
-                                nproj_begin, self.getNumProjectionsLowerThan(),
-                                mark_err_control_begin, self.calcMarkerErrorControlPoint(),
-                                mark_err_check_begin, self.calcMarkerErrorCheckPoint(),
-                                scale_err_control_begin, self.calcScaleBarErrorControl(),
-                                scale_err_check_begin, self.calcScaleBarErrorCheck(),
-                                threshold_begin, threshold_final,
-                                rev_pts,
-                                )
+        self.updateTreeEntries(report)
  
      
 
 
-    def updateTreeEntries(self, step, N_iter,
-                                n_points_begin, n_points_left,
-                                rms_begin, rms_final,
-                                seuw_begin, seuw_final,
-                                cam_err_begin, cam_err_final,
-                                nproj_begin, nproj_final,
-                                mark_err_control_begin, mark_err_control_final,
-                                mark_err_check_begin, mark_err_check_final,
-                                scale_err_control_begin, scale_err_control_final,
-                                scale_err_check_begin, scale_err_check_final,
-                                threshold_begin, threshold_final,
-                                rev_pts,
-                          ):
+    def updateTreeEntries(self, report):
  
-          step_translator = {'Reconstruction Uncertainty':'Step 1' ,
-                             'Projection Accuracy':'Step 2',
-                             'Reprojection Error': 'Step 3', 
-                             'Reprojection Error (RMSE Minimization)': 'Step 4',
-                             }
-          
+          r = report
+          step = r.step
 
           if step[:4] != 'Step':
-              key = step_translator[step]
+              key = self._STEP_TRANSLATOR[step]
           else:
               key = step
 
 
-          self.tree_widgets[key]["Num. iterations"].setText(1, str(N_iter)) 
-          self.tree_widgets[key]["Num. points"].setText(1, '{0: <10} ---> {1: <10}'.format(n_points_begin, n_points_left))
+          self.tree_widgets[key]["Num. iterations"].setText(1, str(r.n_iter)) 
+          self.tree_widgets[key]["Num. points"].setText(1, f'{r.n_points_begin: <10} ---> {r.n_points_left: <10}')
 
-          self.tree_widgets[key]["RMSE"].setText(1, '{0: <10} ---> {1: <10} (pix)'.format(round(rms_begin, 5), round(rms_final, 5)))
-          self.tree_widgets[key]["SEUW"].setText(1, '{0: <10} ---> {1: <10}.'.format(round(seuw_begin, 5), round(seuw_final, 5)))
+          self.tree_widgets[key]["RMSE"].setText(1, f'{round(r.rms_begin, 5): <10} ---> {round(r.rms_final, 5): <10} (pix)')
+          self.tree_widgets[key]["SEUW"].setText(1, f'{round(r.seuw_begin, 5): <10} ---> {round(r.seuw_final, 5): <10}.')
 
-          if cam_err_begin and cam_err_final:
-              self.tree_widgets[key]["Camera error"].setText(1, '{0: <10} ---> {1: <10} (m)'.format(round(cam_err_begin, 5), round(cam_err_final, 5)))
+          if r.cam_err_begin and r.cam_err_final:
+              self.tree_widgets[key]["Camera error"].setText(1, f'{round(r.cam_err_begin, 5): <10} ---> {round(r.cam_err_final, 5): <10} (m)')
           else:
               self.tree_widgets[key]["Camera error"].setText(1, '')
         
                
-          if mark_err_control_begin and mark_err_control_final:
-               self.tree_widgets[key]["Control point error"].setText(1, '{0: <10} ---> {1: <10} (m)'.format(round(mark_err_control_begin, 6), round(mark_err_control_final, 6)))
+          if r.mark_err_control_begin and r.mark_err_control_final:
+               self.tree_widgets[key]["Control point error"].setText(1, f'{round(r.mark_err_control_begin, 6): <10} ---> {round(r.mark_err_control_final, 6): <10} (m)')
           else:
                self.tree_widgets[key]["Control point error"].setText(1, '')
                
-          if mark_err_check_begin and mark_err_check_final:
-               self.tree_widgets[key]["Check point error"].setText(1, '{0: <10} ---> {1: <10} (m)'.format(round(mark_err_check_begin, 6), round(mark_err_check_final, 6)))
+          if r.mark_err_check_begin and r.mark_err_check_final:
+               self.tree_widgets[key]["Check point error"].setText(1, f'{round(r.mark_err_check_begin, 6): <10} ---> {round(r.mark_err_check_final, 6): <10} (m)')
           else:
                self.tree_widgets[key]["Check point error"].setText(1, '')
                
                
-          if scale_err_check_begin and scale_err_check_final:
-               self.tree_widgets[key]["Check scale error"].setText(1, '{0:f} ---> {1:f} (m)'.format(round(scale_err_check_begin, 6), round(scale_err_check_final, 6)))
+          if r.scale_err_check_begin and r.scale_err_check_final:
+               self.tree_widgets[key]["Check scale error"].setText(1, f'{round(r.scale_err_check_begin, 6):f} ---> {round(r.scale_err_check_final, 6):f} (m)')
           else:
                self.tree_widgets[key]["Check scale error"].setText(1, '')    
 
-          if scale_err_control_begin and scale_err_control_final:
-               self.tree_widgets[key]["Control scale error"].setText(1, '{0:f} ---> {1:f} (m)'.format(round(scale_err_control_begin, 6), round(scale_err_control_final, 6)))
+          if r.scale_err_control_begin and r.scale_err_control_final:
+               self.tree_widgets[key]["Control scale error"].setText(1, f'{round(r.scale_err_control_begin, 6):f} ---> {round(r.scale_err_control_final, 6):f} (m)')
           else:
                self.tree_widgets[key]["Control scale error"].setText(1, '')      
 
           if key != "Step 4":
           
-              if threshold_begin and threshold_final:
-                  self.tree_widgets[key]["Level"].setText(1, '{0:f} ---> {1:f}'.format(round(threshold_begin, 6), round(threshold_final, 6)))
+              if r.threshold_begin and r.threshold_final:
+                  self.tree_widgets[key]["Level"].setText(1, f'{round(r.threshold_begin, 6):f} ---> {round(r.threshold_final, 6):f}')
               else:
                   self.tree_widgets[key]["Level"].setText(1, '')
 
-              if rev_pts:
-                  self.tree_widgets[key]["Rev. it. / pts."].setText(1, '{}'.format(rev_pts))
+              if r.rev_pts:
+                  self.tree_widgets[key]["Rev. it. / pts."].setText(1, r.rev_pts)
               else:
                   self.tree_widgets[key]["Rev. it. / pts."].setText(1, '')
                
                
-          self.tree_widgets[key]["Num. proj. <100"].setText(1, '{0: <10} ---> {1: <10}'.format(round(nproj_begin, 6), round(nproj_final, 6)))
+          self.tree_widgets[key]["Num. proj. <100"].setText(1, f'{round(r.nproj_begin, 6): <10} ---> {round(r.nproj_final, 6): <10}')
 
          
     
@@ -1529,40 +1656,41 @@ class NewWindow(QDialog):
         points = point_cloud.points
         npoints = len(points)
         tracks = point_cloud.tracks
-        point_ids = [-1] * len(point_cloud.tracks)
+
+        cache_key = (chunk.key, npoints, len(tracks))
+        if cache_key in self._proj_cache:
+            return self._proj_cache[cache_key]
+
+        # whether each track has a valid point
+        track_ids = np.fromiter((p.track_id for p in points), dtype=np.int64, count=npoints)
+        valid = np.fromiter((p.valid for p in points), dtype=bool, count=npoints)
+        track_valid = np.zeros(len(tracks), dtype=bool)
+        track_valid[track_ids] = valid
         
         sums = 0
 
-        for point_id in range(0, npoints):
-            point_ids[points[point_id].track_id] = point_id
+        cameras = chunk.cameras
 
+        tids_key = (chunk.key, len(tracks))
+        if tids_key != self._proj_tids_key:
+            self._proj_tids = {camera.key: np.fromiter((proj.track_id for proj in projections[camera]), dtype=np.int64) 
+                               for camera in cameras 
+                               if camera.type != Metashape.Camera.Type.Keyframe and camera.transform} # skipping Keyframes
+            self._proj_tids_key = tids_key
 
-        cameras_with_proj = 0
-        for camera in chunk.cameras: 
-            nprojections = 0
-            if camera.type == Metashape.Camera.Type.Keyframe:
-                continue # skipping Keyframes
-            if not camera.transform:
-                continue
-            
-            cameras_with_proj+=1  
-            for proj in projections[camera]:
-                track_id = proj.track_id
-                point_id = point_ids[track_id]
-                if point_id < 0:
-                    continue
-                if not points[point_id].valid:
-                    continue
-                    
-                nprojections += 1
+        cameras_with_proj = len(self._proj_tids)
+        for proj_track_ids in self._proj_tids.values(): 
+
+            nprojections = int(np.count_nonzero(track_valid[proj_track_ids]))
             
             if nprojections < 100:
                 sums+=1
 
         # to also consider cameras without projections:
-        cameras_without_proj = (len(chunk.cameras)-cameras_with_proj)
+        cameras_without_proj = (len(cameras)-cameras_with_proj)
         sums += cameras_without_proj
-  
+
+        self._proj_cache[cache_key] = sums
                 
         return sums
 
@@ -1574,214 +1702,140 @@ class NewWindow(QDialog):
         
         chunk = self.chunk
         T = chunk.transform.matrix
-        crs = chunk.crs
 
-        sums = 0
-        num = 0
-        for camera in chunk.cameras:
-            
-        
-            if not camera.transform:
-                continue
-            if not camera.reference.location:
-                continue
-                
-            if camera.reference.enabled:
+        # the transformation of the reference locations is the same for all cameras
+        if chunk.camera_crs == None:
+            unproject = chunk.crs.unproject
+        else:
+            unproject = chunk.camera_crs.unproject
 
-                estimated_geoc = chunk.transform.matrix.mulp(camera.center)
+        cameras = [camera for camera in chunk.cameras 
+                   if camera.transform and camera.reference.location and camera.reference.enabled]
 
-                if chunk.camera_crs == None:
-                    error =  chunk.crs.unproject(camera.reference.location) - estimated_geoc
-                else:
-                    error = chunk.camera_crs.unproject(camera.reference.location) - estimated_geoc
+        centers = np.array([list(camera.center) for camera in cameras], dtype=np.float64).reshape(-1, 3)
+        references = np.array([list(unproject(camera.reference.location)) for camera in cameras], dtype=np.float64).reshape(-1, 3)
+
+        # rotation/scale and translation part of the chunk transform, applied to all camera centers at once
+        M = np.array([[T[row, col] for col in range(4)] for row in range(4)], dtype=np.float64)
+        estimated_geoc = centers @ M[:3, :3].T + M[:3, 3]
 
-                error = error.norm()
-                sums += error**2
-                num += 1
+        sums = float(np.sum((references - estimated_geoc)**2))
+        num = len(cameras)
             
-        try:  
-            return math.sqrt(sums / num)
-        except:
-            return None
+        return math.sqrt(sums / num) if num else None
         
         
-    def calcScaleBarErrorControl(self):
-
-        '''calculating the scale bar error in meter as shown in the reference window of the main program
+    def _calcScalebarErrors(self):
+        '''calculating the scale bar errors in meter of control and check scale bars in a single pass, 
+           as shown in the reference window of the main program
            modified after https://www.agisoft.com/forum/index.php?topic=6147.0'''
-    
-        chunk = self.chunk #active chunk
-        s, n = 0, 0
-        for scalebar in chunk.scalebars:
-            dist_source = scalebar.reference.distance
-            if not dist_source:
-                continue #skipping scalebars without source values
-                
-            if scalebar.reference.enabled:
-                
-                if type(scalebar.point0) == Metashape.Camera:
-                    if not (scalebar.point0.center and scalebar.point1.center):
-                        continue #skipping scalebars with undefined ends
-                    dist_estimated = (scalebar.point0.center - scalebar.point1.center).norm() * chunk.transform.scale
-                else:
-                    if not (scalebar.point0.position and scalebar.point1.position):
-                        continue #skipping scalebars with undefined ends
-                    dist_estimated = (scalebar.point0.position - scalebar.point1.position).norm() * chunk.transform.scale
-                dist_error = dist_estimated - dist_source
-            
-                s= s + dist_error**2
-                n+=1
-                     
-        if n > 0:        
-            return math.sqrt(s/n)
-        else:
-            return None
-            
-            
-    def calcScaleBarErrorCheck(self):
-        '''calculating the scale bar error in meter as shown in the reference window of the main program
-           modified after https://www.agisoft.com/forum/index.php?topic=6147.0'''
-    
+
         chunk = self.chunk #active chunk
-        s, n = 0, 0
+        scale = chunk.transform.scale
+
+        s_ctrl, n_ctrl = 0, 0
+        s_chk, n_chk = 0, 0
+
         for scalebar in chunk.scalebars:
             dist_source = scalebar.reference.distance
             if not dist_source:
                 continue #skipping scalebars without source values
-                
-            if not scalebar.reference.enabled:
-                
-                if type(scalebar.point0) == Metashape.Camera:
-                    if not (scalebar.point0.center and scalebar.point1.center):
-                        continue #skipping scalebars with undefined ends
-                    dist_estimated = (scalebar.point0.center - scalebar.point1.center).norm() * chunk.transform.scale
-                else:
-                    if not (scalebar.point0.position and scalebar.point1.position):
-                        continue #skipping scalebars with undefined ends
-                    dist_estimated = (scalebar.point0.position - scalebar.point1.position).norm() * chunk.transform.scale
-                dist_error = dist_estimated - dist_source
-            
-                s= s + dist_error**2
-                n+=1
-                     
-        if n > 0:        
-            return math.sqrt(s/n)
-        else:
-            return None
-
-
-
-    def calcMarkerErrorControlPoint(self):
-        '''calculating the marker error in meter as shown in the reference window of the main program
-           modified after https://github.com/agisoft-llc/metashape-scripts/blob/master/src/save_estimated_reference.py'''
-
-        def getCartesianCrs(crs):
-            ecef_crs = crs.geoccs
-            if ecef_crs is None:
-                 ecef_crs = Metashape.CoordinateSystem('LOCAL')
-
-            return ecef_crs
-
 
+            if isinstance(scalebar.point0, Metashape.Camera):
+                if not (scalebar.point0.center and scalebar.point1.center):
+                    continue #skipping scalebars with undefined ends
+                dist_estimated = (scalebar.point0.center - scalebar.point1.center).norm() * scale
+            else:
+                if not (scalebar.point0.position and scalebar.point1.position):
+                    continue #skipping scalebars with undefined ends
+                dist_estimated = (scalebar.point0.position - scalebar.point1.position).norm() * scale
 
-        self.estimated_location = None
-        self.reference_location = None
-        self.error_location = None
-        self.sigma_location = None
+            dist_error = dist_estimated - dist_source
 
-        chunk = self.chunk
-        s, n = 0, 0
+            if scalebar.reference.enabled:
+                s_ctrl = s_ctrl + dist_error**2
+                n_ctrl+=1
+            else:
+                s_chk = s_chk + dist_error**2
+                n_chk+=1
 
-        for marker in chunk.markers:
+        control = math.sqrt(s_ctrl/n_ctrl) if n_ctrl > 0 else None
+        check = math.sqrt(s_chk/n_chk) if n_chk > 0 else None
 
-            if not marker.position:
-                continue
-                
-            if marker.reference.enabled:
+        return control, check
 
 
-                transform = chunk.transform.matrix
-                crs = chunk.crs
+    def calcScaleBarErrorControl(self):
+        '''calculating the scale bar error in meter of the control scale bars'''
 
-                if chunk.marker_crs:
-                    transform = Metashape.CoordinateSystem.datumTransform(crs, chunk.marker_crs) * transform
-                    crs = chunk.marker_crs
+        return self._calcScalebarErrors()[0]
 
-                ecef_crs = getCartesianCrs(crs)
 
-                location_ecef = transform.mulp(marker.position)
+    def calcScaleBarErrorCheck(self):
+        '''calculating the scale bar error in meter of the check scale bars'''
 
-                self.estimated_location = Metashape.CoordinateSystem.transform(location_ecef, ecef_crs, crs)
-                if marker.reference.location:
-                    self.reference_location = marker.reference.location
-                    self.error_location = Metashape.CoordinateSystem.transform(self.estimated_location, crs, ecef_crs) - Metashape.CoordinateSystem.transform(self.reference_location, crs, ecef_crs)
-                    self.error_location = crs.localframe(location_ecef).rotation() * self.error_location
+        return self._calcScalebarErrors()[1]
 
-                    s +=  self.error_location.norm()**2
-                    n+=1
 
-        try:
-            return math.sqrt(s / n)
-        except:
-            return None
-            
-            
-    def calcMarkerErrorCheckPoint(self):
-        '''calculating the marker error in meter as shown in the reference window of the main program
+    def _calcMarkerErrors(self):
+        '''calculating the marker errors in meter of control and check points in a single pass, 
+           as shown in the reference window of the main program
            modified after https://github.com/agisoft-llc/metashape-scripts/blob/master/src/save_estimated_reference.py'''
 
-        def getCartesianCrs(crs):
-            ecef_crs = crs.geoccs
-            if ecef_crs is None:
-                 ecef_crs = Metashape.CoordinateSystem('LOCAL')
-
-            return ecef_crs
+        chunk = self.chunk
 
+        # the transformation is the same for all markers
+        transform = chunk.transform.matrix
+        crs = chunk.crs
+        if chunk.marker_crs:
+            transform = Metashape.CoordinateSystem.datumTransform(crs, chunk.marker_crs) * transform
+            crs = chunk.marker_crs
 
+        ecef_crs = crs.geoccs
+        if ecef_crs is None:
+             ecef_crs = Metashape.CoordinateSystem('LOCAL')
 
-        self.estimated_location = None
-        self.reference_location = None
-        self.error_location = None
-        self.sigma_location = None
-
-        chunk = self.chunk
-        s, n = 0, 0
+        s_ctrl, n_ctrl = 0, 0
+        s_chk, n_chk = 0, 0
 
         for marker in chunk.markers:
-             
             if not marker.position:
                 continue
-      
-          
-            if not marker.reference.enabled:
+
+            if not marker.reference.location:
+                continue
+
+            location_ecef = transform.mulp(marker.position)
+            estimated_location = Metashape.CoordinateSystem.transform(location_ecef, ecef_crs, crs)
             
-             
-                transform = chunk.transform.matrix
-                crs = chunk.crs
+            error_location = Metashape.CoordinateSystem.transform(estimated_location, crs, ecef_crs) - Metashape.CoordinateSystem.transform(marker.reference.location, crs, ecef_crs)
+            error_location = crs.localframe(location_ecef).rotation() * error_location
 
-                if chunk.marker_crs:
-                    transform = Metashape.CoordinateSystem.datumTransform(crs, chunk.marker_crs) * transform
-                    crs = chunk.marker_crs
+            if marker.reference.enabled:
+                s_ctrl +=  error_location.norm()**2
+                n_ctrl+=1
+            else:
+                s_chk +=  error_location.norm()**2
+                n_chk+=1
 
-                ecef_crs = getCartesianCrs(crs)
+        control = math.sqrt(s_ctrl / n_ctrl) if n_ctrl > 0 else None
+        check = math.sqrt(s_chk / n_chk) if n_chk > 0 else None
 
-                location_ecef = transform.mulp(marker.position)
+        return control, check
 
-                self.estimated_location = Metashape.CoordinateSystem.transform(location_ecef, ecef_crs, crs)
-                if marker.reference.location:
-                    self.reference_location = marker.reference.location
-                    self.error_location = Metashape.CoordinateSystem.transform(self.estimated_location, crs, ecef_crs) - Metashape.CoordinateSystem.transform(self.reference_location, crs, ecef_crs)
-                    self.error_location = crs.localframe(location_ecef).rotation() * self.error_location
 
-                    s +=  self.error_location.norm()**2
-                    n+=1
+    def calcMarkerErrorControlPoint(self):
+        '''calculating the marker error in meter of the control points'''
 
-        try:
-            return math.sqrt(s / n)
-        except:
-            return None
-  
+        return self._calcMarkerErrors()[0]
+
+
+    def calcMarkerErrorCheckPoint(self):
+        '''calculating the marker error in meter of the check points'''
+
+        return self._calcMarkerErrors()[1]
 
+ 
     def runAllSteps(self):
         ''' Method for automatic execution of all steps in a series marked in the "Automatic execution" field '''
 
@@ -1789,12 +1843,15 @@ class NewWindow(QDialog):
 
             if self.auto_run_check_boxes[step].isChecked():
 
+                self._ensureTabBuilt(index)
                 self.tabwidget.setCurrentIndex(index)
 
+                settings = self._settings[step]
+
                 self.executeStep(step = step,
-                                    target_percent = float(self.step_widgets[step]['target_percent_ledit'].text()), 
-                                    target_threshold = float(self.step_widgets[step]['target_threshold_ledit'].text()), 
-                                    max_iter = float(self.step_widgets[step]['max_iter_ledit'].text()),
+                                    target_percent = settings['target_percent'], 
+                                    target_threshold = settings['target_threshold'], 
+                                    max_iter = settings['num_iterations'],
                                     )
                                     
                 self.updateChunkMemoryTree()
@@ -1804,16 +1861,43 @@ class NewWindow(QDialog):
 
     def setCurrentChunk(self):
 
+        # edits still pending belong to the previous chunk
+        self._flushPendingEdits()
+
+        self._chunk_confirmed = False
+
         chunk_name = self.chunk_combo_box.currentText()
         self.chunk = self.chunk_dict[chunk_name]
 
+        self._refreshCur()
+
+    def _refreshCur(self):
+
+        # chunk memory entry of the current chunk, restored sessions may lack newer chunks
+        if self.chunk.label not in self.chunk_memory:
+            self.addChunk(self.chunk)
+
+        self._cur = self.chunk_memory[self.chunk.label]
+
+        # settings of each step, the same dictionaries the chunk memory holds
+        self._settings = {step: self._cur['tab_settings'][ix] for step, ix in _STEP_TO_IX.items()}
+
      
 
     def set_all_points_to_valid(self):
-        for p in self.chunk.point_cloud.points:
-            p.selected = False
 
-        print(len(self.chunk.point_cloud.points))
+        tie_points = self.chunk.tie_points
+        points = tie_points.points
+
+        # a single native call where the installed version offers one
+        reset_selection = getattr(tie_points, 'resetSelection', None)
+        if reset_selection is not None:
+            reset_selection()
+        else:
+            for p in points:
+                p.selected = False
+
+        print(len(points))
         
  
   